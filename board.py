@@ -1,10 +1,13 @@
-import itertools
 import platform
-from dataclasses import dataclass
+import random
 from typing import Union
 
 
 EMPTY = -1
+DIRS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+ROWS = 9
+COLS = 9
 
 if platform.system() == "Linux":
     from colorama import Back, Style
@@ -29,163 +32,327 @@ COLOR_MAPPING = {
     2: BACK_RED,
 }
 
+# pieces of printed board, built once
+COLUMN_NUMBERS = "    " + "   ".join(map(str, range(COLS)))
+DISC_STR = {cell: f"{color or ''}   {BACK_GREEN}" for cell, color in COLOR_MAPPING.items()}
+TOP_BOT_LINE = (
+    "  " + BACK_GREEN + " ".join(["+"] + (["-  "] * COLS)[:-1] + [f"- +{RESET_COLOR}"])
+)
+ROW_SEPARATOR = "  " + BACK_GREEN + " ".join([" "] + ["-  "] * COLS) + RESET_COLOR
+
+# Bitboard layout: square (row, column) is bit row * COLS + column.
+BOARD_MASK = (1 << (ROWS * COLS)) - 1
+LEFT_EDGE = sum(1 << (row * COLS) for row in range(ROWS))
+RIGHT_EDGE = LEFT_EDGE << (COLS - 1)
+NOT_LEFT_EDGE = BOARD_MASK ^ LEFT_EDGE
+NOT_RIGHT_EDGE = BOARD_MASK ^ RIGHT_EDGE
+
+
+# Directions written as (shift amount, mask of squares that stay on board
+# after the shift, i.e. didn't wrap around to the opposite edge), split by
+# the direction of the bit shift.
+LEFT_SHIFTS = (
+    (COLS, BOARD_MASK),  # south
+    (1, NOT_LEFT_EDGE),  # east
+    (COLS + 1, NOT_LEFT_EDGE),  # south-east
+    (COLS - 1, NOT_RIGHT_EDGE),  # south-west
+)
+RIGHT_SHIFTS = (
+    (COLS, BOARD_MASK),  # north
+    (1, NOT_RIGHT_EDGE),  # west
+    (COLS - 1, NOT_LEFT_EDGE),  # north-east
+    (COLS + 1, NOT_RIGHT_EDGE),  # north-west
+)
+
+
+def _ray(row: int, column: int, dy: int, dx: int) -> tuple[int, ...]:
+    ray = []
+    row += dy
+    column += dx
+    # stop when we reach board border
+    while 0 <= row < ROWS and 0 <= column < COLS:
+        ray.append(1 << (row * COLS + column))
+        row += dy
+        column += dx
+    return tuple(ray)
+
+
+# RAYS[square] holds, for every direction that doesn't leave the board right
+# away, bits of the squares met when walking from square towards the edge.
+RAYS = [
+    [
+        ray
+        for dy, dx in DIRS
+        if (ray := _ray(row, column, dy, dx))
+    ]
+    for row in range(ROWS)
+    for column in range(COLS)
+]
+
+# NEIGHBORS[square] is bitboard of squares adjacent to square
+NEIGHBORS = [sum(ray[0] for ray in rays) for rays in RAYS]
+
+# COORDS[square] is (row, column) of square
+COORDS = [divmod(square, COLS) for square in range(ROWS * COLS)]
+
+
+def _would_flip(own: int, opponents: int, square: int) -> int:
+    """
+    Bitboard of opponents' discs outflanked by own disc placed on square
+    (given as index, not bit).
+    """
+    flips = 0
+    for ray in RAYS[square]:
+        visited_discs = 0
+        for disc in ray:
+            if disc & opponents:
+                # add met disc to visited discs
+                visited_discs |= disc
+            else:
+                if disc & own:
+                    # we found outflanking disc, flip visited discs
+                    flips |= visited_discs
+                # otherwise reached blank space, nothing outflanked
+                break
+    return flips
+
+
+def _valid_moves(own: int, opponents: int) -> int:
+    """
+    Bitboard of all empty squares where placing own disc outflanks something.
+    Uses Kogge-Stone fill: run of opposing discs is at most 7 long on 9x9
+    board, so own discs are spread through opponents in steps of 1, 2 and 4.
+    """
+    empty = BOARD_MASK & ~(own | opponents)
+    moves = 0
+    for amount, mask in LEFT_SHIFTS:
+        propagate = opponents & mask
+        fill = own | propagate & (own << amount)
+        propagate &= propagate << amount
+        fill |= propagate & (fill << 2 * amount)
+        propagate &= propagate << 2 * amount
+        fill |= propagate & (fill << 4 * amount)
+        moves |= ((fill & opponents) << amount) & mask
+    for amount, mask in RIGHT_SHIFTS:
+        propagate = opponents & mask
+        fill = own | propagate & (own >> amount)
+        propagate &= propagate >> amount
+        fill |= propagate & (fill >> 2 * amount)
+        propagate &= propagate >> 2 * amount
+        fill |= propagate & (fill >> 4 * amount)
+        moves |= ((fill & opponents) >> amount) & mask
+    return moves & empty
+
+
+# Zobrist keys, one random number per square and player; hash of position is
+# XOR of keys of all discs on board (empty squares contribute nothing).
+_zobrist_random = random.Random(2137)
+ZOBRIST = [
+    [_zobrist_random.getrandbits(64) for _ in range(3)] for _ in range(ROWS * COLS)
+]
+
 
 class ForbiddenMove(Exception):
     pass
 
 
-@dataclass
 class Board:
     """
-    Stateful board of Othello game
+    Stateful board of Othello game.
+    Discs of each player are kept as a bitboard, see BOARD_MASK for layout.
     """
 
-    board: list[list[int]]
-    rows: int = 9
-    columns: int = 9
+    __slots__ = ("discs", "hash", "_moves_cache")
+
+    discs: list[int]
+    hash: int
+    rows = ROWS
+    columns = COLS
 
     def __init__(self) -> None:
         super().__init__()
-        self.board = [[EMPTY for _ in range(self.columns)] for _ in range(self.rows)]
-
-    def top_bot_line(self) -> str:
-        return (
-            "  "
-            + BACK_GREEN
-            + " ".join(
-                ["+"] + (["-  "] * self.columns)[:-1] + [f"- +{RESET_COLOR}\n"]
-            )
-        )
+        self.discs = [0, 0, 0]
+        self.hash = 0
+        # (hash, player, moves) of last valid_moves call
+        self._moves_cache = (None, None, ())
+
+    @property
+    def board(self) -> list[list[int]]:
+        """
+        Decode bitboards into rows of cells (player number or EMPTY).
+        Meant for display, use discs or cell in hot code.
+        """
+        board = [[EMPTY for _ in range(COLS)] for _ in range(ROWS)]
+        for player, discs in enumerate(self.discs):
+            while discs:
+                disc = discs & -discs
+                row, column = COORDS[disc.bit_length() - 1]
+                board[row][column] = player
+                discs ^= disc
+        return board
+
+    def occupied(self) -> int:
+        return self.discs[0] | self.discs[1] | self.discs[2]
+
+    def cell(self, row: int, column: int) -> int:
+        """
+        Player whose disc lies on (row, column) or EMPTY.
+        """
+        square = 1 << (row * COLS + column)
+        black, white, red = self.discs
+        if black & square:
+            return 0
+        if white & square:
+            return 1
+        if red & square:
+            return 2
+        return EMPTY
 
     def __str__(self):
-        output = ""
         # column numbering
-        output += "    " + "   ".join(map(str, range(self.columns))) + "\n"
-        # top line
-        output += self.top_bot_line()
-        # iterate over all but last row
+        lines = [COLUMN_NUMBERS, TOP_BOT_LINE]
         for row_num, row in enumerate(self.board):
-            output += f"{row_num} {BACK_GREEN}|"
-            for cell in row:
-                output += self.print_disc(cell) + "|"
-            output += f"{RESET_COLOR}\n"
-            if row_num != self.rows - 1:
-                output += (
-                    "  "
-                    + BACK_GREEN
-                    + " ".join([" "] + ["-  "] * self.columns)
-                    + RESET_COLOR
-                    + "\n"
-                )
-        # bottom line
-        output += self.top_bot_line()
-        return output
-
-    @staticmethod
-    def print_disc(cell):
-        color = COLOR_MAPPING[cell]
-        return f"{color or ''}   {BACK_GREEN}"
+            if row_num:
+                lines.append(ROW_SEPARATOR)
+            lines.append(
+                f"{row_num} {BACK_GREEN}|"
+                + "|".join([DISC_STR[cell] for cell in row])
+                + f"|{RESET_COLOR}"
+            )
+        lines.append(TOP_BOT_LINE)
+        return "\n".join(lines) + "\n"
 
     def setup_three_players(self):
         """
         Create starting position for 3 player game
         """
-        self.board[3][3] = self.board[3][5] = self.board[4][4] = 0
-        self.board[3][4] = self.board[5][3] = self.board[5][5] = 1
-        self.board[4][3] = self.board[4][5] = self.board[5][4] = 2
+        starting_squares = (
+            ((3, 3), (3, 5), (4, 4)),
+            ((3, 4), (5, 3), (5, 5)),
+            ((4, 3), (4, 5), (5, 4)),
+        )
+        for player, squares in enumerate(starting_squares):
+            for row, column in squares:
+                self.discs[player] |= 1 << (row * COLS + column)
+                self.hash ^= ZOBRIST[row * COLS + column][player]
+
+    def place(self, row: int, column: int, player: int) -> int:
+        """
+        Put player's disc on (row, column) and flip outflanked discs.
+        Return bitboard of flipped discs.
+        """
+        to_flip = self._move_flips(row, column, player)
+        if to_flip is None:
+            raise ForbiddenMove(self.validate_placing(row, column, player)[1])
+        discs = self.discs
+        square = row * COLS + column
+        zobrist = ZOBRIST
+        hash_ = self.hash ^ zobrist[square][player]
+        for opponent in range(len(discs)):
+            if opponent == player:
+                continue
+            flipped = discs[opponent] & to_flip
+            discs[opponent] ^= flipped
+            while flipped:
+                disc = flipped & -flipped
+                keys = zobrist[disc.bit_length() - 1]
+                hash_ ^= keys[opponent] ^ keys[player]
+                flipped ^= disc
+        discs[player] |= to_flip | 1 << square
+        self.hash = hash_
+        return to_flip
 
-    def place(self, row: int, column: int, player: int):
-        self.validate_placing(row, column, player)
-        to_flip = self.would_flip(row, column, player)
-        for x, y in to_flip:
-            self.board[x][y] = player
-        self.board[row][column] = player
+    def place_with_record(self, row: int, column: int, player: int) -> tuple:
+        """
+        Same as place, but return record of previous position,
+        so the move can be taken back with undo.
+        """
+        record = (tuple(self.discs), self.hash)
+        self.place(row, column, player)
+        return record
+
+    def undo(self, record: tuple) -> None:
+        """
+        Restore position recorded by place_with_record
+        (including discs flipped by that move).
+        """
+        discs, self.hash = record
+        self.discs[:] = discs
+
+    def _move_flips(self, row: int, column: int, player: int) -> Union[int, None]:
+        """
+        Bitboard of discs flipped by player's move, None if move is invalid.
+        No adjacency check needed: nothing flipped means no adjacent disc either.
+        """
+        if row < 0 or row >= ROWS or column < 0 or column >= COLS:
+            return None
+        square = row * COLS + column
+        discs = self.discs
+        own = discs[player]
+        occupied = discs[0] | discs[1] | discs[2]
+        if occupied & (1 << square):
+            return None
+        return _would_flip(own, occupied ^ own, square) or None
 
     def validate_placing(self, row: int, column: int, player: int) -> (bool, str):
         """
         Make sure move is valid.
         Return (True, "") otherwise (False, "reason for failure")
         """
+        if self._move_flips(row, column, player) is not None:
+            return True, ""
+
+        # find out why move is invalid
         # outside bounds
-        if row < 0 or row >= self.rows or column < 0 or column >= self.columns:
+        if row < 0 or row >= ROWS or column < 0 or column >= COLS:
             return False, "Placement out of bounds."
 
+        square = row * COLS + column
+        occupied = self.occupied()
+
         # square taken
-        if self.board[row][column] != EMPTY:
+        if occupied & (1 << square):
             return False, "Square taken."
 
         # square not adjacent to any current discs
-        is_adjacent = False
-        for y in [row - 1, row, row + 1]:
-            for x in [column - 1, column, column + 1]:
-                # outside of bounds, skip
-                if y < 0 or y >= self.rows or x < 0 or x >= self.columns:
-                    continue
-                # this is handled in square taken, but double-check
-                if row == y and column == x:
-                    continue
-                # check if square is taken
-                if self.board[y][x] != EMPTY:
-                    is_adjacent = True
-                    break
-            if is_adjacent:
-                break
-        if not is_adjacent:
+        if not occupied & NEIGHBORS[square]:
             return False, "New disc must be adjacent to some existing one."
 
         # placing must flip at least one opposing disk
-        if not self.would_flip(row, column, player):
-            return False, "Move won't flip any disks."
+        return False, "Move won't flip any disks."
 
-        return True, ""
-
-    def would_flip(self, row, column, player) -> list[(int, int)]:
-        flips = []
-        for dy, dx in itertools.product([-1, 0, 1], [-1, 0, 1]):
-            visited_discs = []
-            if dy == dx == 0:
-                continue
-            new_row = row + dy
-            new_col = column + dx
-            # stop when we reach board border
-            while not (
-                new_row < 0
-                or new_row >= self.rows
-                or new_col < 0
-                or new_col >= self.columns
-            ):
-                if self.board[new_row][new_col] == player:
-                    # we found outflanking disc, append visited disc to flip list
-                    flips += visited_discs
-                    break
-                elif self.board[new_row][new_col] == EMPTY:
-                    # reached blank space, no discs could be outflanked
-                    break
-                else:
-                    # add met disc to visited discs
-                    visited_discs.append((new_row, new_col))
-                new_row += dy
-                new_col += dx
-
-        return flips
+    def valid_moves_mask(self, player: int) -> int:
+        """
+        Bitboard of all squares where player can place a disc.
+        """
+        discs = self.discs
+        own = discs[player]
+        return _valid_moves(own, (discs[0] | discs[1] | discs[2]) ^ own)
 
     def has_valid_move(self, player) -> bool:
-        for row in range(self.rows):
-            for column in range(self.columns):
-                valid, _ = self.validate_placing(row, column, player)
-                if valid:
-                    return True
+        return len(self.valid_moves(player)) > 0
 
-        return False
+    def valid_moves(self, player: int) -> tuple[(int, int), ...]:
+        """
+        Tuple of (row, column) moves available to player.
+        Result for the last asked position and player is remembered, so
+        has_valid_move followed by valid_moves generates moves once.
+        """
+        cached_hash, cached_player, moves = self._moves_cache
+        if cached_hash == self.hash and cached_player == player:
+            return moves
 
-    def valid_moves(self, player: int):
+        moves_mask = self.valid_moves_mask(player)
         moves = []
-        for row in range(self.rows):
-            for column in range(self.columns):
-                valid, _ = self.validate_placing(row, column, player)
-                if valid:
-                    moves.append((row, column))
+        append = moves.append
+        coords = COORDS
+        while moves_mask:
+            move = moves_mask & -moves_mask
+            append(coords[move.bit_length() - 1])
+            moves_mask ^= move
 
+        moves = tuple(moves)
+        self._moves_cache = (self.hash, player, moves)
         return moves
 
     def get_winner(self) -> Union[int, None]:
@@ -195,14 +362,12 @@ class Board:
 
         :return: winning player number or None
         """
-        scores = [0, 0, 0]
-        for row in self.board:
-            for cell in row:
-                scores[cell] += 1
+        black, white, red = self.discs
+        s0, s1, s2 = black.bit_count(), white.bit_count(), red.bit_count()
 
-        max_score = max(scores)
+        max_score = max(s0, s1, s2)
 
-        if len(list(filter(lambda x: x == max_score, scores))) > 1:
+        if (s0 == max_score) + (s1 == max_score) + (s2 == max_score) > 1:
             return None  # draw
 
-        return scores.index(max_score)
+        return (s1 == max_score) + 2 * (s2 == max_score)
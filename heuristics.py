@@ -1,6 +1,18 @@
 from typing import List
 
-from board import Board
+from board import Board, COLS, ROWS
+
+
+def weighted_sum(discs: int, weights: list[int]) -> int:
+    """
+    Sum of weights (indexed by square) of squares set in discs bitboard.
+    """
+    total = 0
+    while discs:
+        disc = discs & -discs
+        total += weights[disc.bit_length() - 1]
+        discs ^= disc
+    return total
 
 
 class Heuristic:
@@ -13,7 +25,7 @@ class GreedyHeuristic(Heuristic):
         """
         Move decision with greedy strategy based on board state.
         """
-        return sum([sum(map(lambda cell: cell == player, row)) for row in board.board])
+        return board.discs[player].bit_count()
 
 
 class WeightedSumHeuristic(Heuristic):
@@ -28,17 +40,13 @@ class WeightedSumHeuristic(Heuristic):
         [-30, -40, -25, -25, -25, -25, -25, -40, -30],
         [60,  -30,  25,  25,  25,  25,  25, -30,  60],
     ]
+    weights = [weight for row in weight_table for weight in row]
 
     def evaluate(self, board: Board, player: int) -> int:
         """
         Move decision with weighted sum strategy based on board state.
         """
-        return sum(
-            [
-                sum(map(lambda x: (x[0] == player) * x[1], zip(row, row_weights)))
-                for row, row_weights in zip(board.board, self.weight_table)
-            ]
-        )
+        return weighted_sum(board.discs[player], self.weights)
 
 
 class WedgeHeuristic(Heuristic):
@@ -69,59 +77,46 @@ class WedgeHeuristic(Heuristic):
             [-130, -40, -25, -25, -25, -25, -25, -40, -130],
             [160, -130, 25, 25, 25, 25, 25, -130, 160],
         ]
-        if board.board[board.rows-1][board.columns-1] == -1: #right bottom corner is free
-            if board.board[board.rows-2][board.columns-1] > -1 and board.board[board.rows-2][board.columns-1] != player:
-                if board.board[board.rows - 3][board.columns - 1] == -1:
-                  if board.board[board.rows-4][board.columns-1] > -1 and board.board[board.rows-4][board.columns-1] != player:
-                      self.weight_table[board.rows - 3][board.columns - 1] += 100
-            if board.board[board.rows - 1][board.columns - 2] > -1 and board.board[board.rows - 1][
-                board.columns - 2] != player:
-                if board.board[board.rows - 1][board.columns - 3] == -1:
-                    if board.board[board.rows - 1][board.columns - 4] > -1 and board.board[board.rows - 1][
-                        board.columns - 4] != player:
-                        self.weight_table[board.rows - 1][board.columns - 3] += 100
-
-        if board.board[board.rows-1][0] == -1: #left bottom corner is free
-            if board.board[board.rows-2][0] > -1 and board.board[board.rows-2][0] != player:
-                if board.board[board.rows - 3][0] == -1:
-                  if board.board[board.rows-4][0] > -1 and board.board[board.rows-4][0] != player:
-                      self.weight_table[board.rows - 3][0] += 100
-            if board.board[board.rows - 1][1] > -1 and board.board[board.rows - 1][
-                1] != player:
-                if board.board[board.rows - 1][2] == -1:
-                    if board.board[board.rows - 1][3] > -1 and board.board[board.rows - 1][
-                        3] != player:
-                        self.weight_table[board.rows - 1][2] += 100
-
-        if board.board[0][0] == -1:  # left top corner is free
-            if board.board[1][0] > -1 and board.board[1][
-                0] != player:
-                if board.board[2][0] == -1:
-                    if board.board[3][0] > -1 and board.board[3][0] != player:
+        if board.cell(ROWS-1, COLS-1) == -1: #right bottom corner is free
+            if board.cell(ROWS-2, COLS-1) > -1 and board.cell(ROWS-2, COLS-1) != player:
+                if board.cell(ROWS - 3, COLS - 1) == -1:
+                  if board.cell(ROWS-4, COLS-1) > -1 and board.cell(ROWS-4, COLS-1) != player:
+                      self.weight_table[ROWS - 3][COLS - 1] += 100
+            if board.cell(ROWS - 1, COLS - 2) > -1 and board.cell(ROWS - 1, COLS - 2) != player:
+                if board.cell(ROWS - 1, COLS - 3) == -1:
+                    if board.cell(ROWS - 1, COLS - 4) > -1 and board.cell(ROWS - 1, COLS - 4) != player:
+                        self.weight_table[ROWS - 1][COLS - 3] += 100
+
+        if board.cell(ROWS-1, 0) == -1: #left bottom corner is free
+            if board.cell(ROWS-2, 0) > -1 and board.cell(ROWS-2, 0) != player:
+                if board.cell(ROWS - 3, 0) == -1:
+                  if board.cell(ROWS-4, 0) > -1 and board.cell(ROWS-4, 0) != player:
+                      self.weight_table[ROWS - 3][0] += 100
+            if board.cell(ROWS - 1, 1) > -1 and board.cell(ROWS - 1, 1) != player:
+                if board.cell(ROWS - 1, 2) == -1:
+                    if board.cell(ROWS - 1, 3) > -1 and board.cell(ROWS - 1, 3) != player:
+                        self.weight_table[ROWS - 1][2] += 100
+
+        if board.cell(0, 0) == -1:  # left top corner is free
+            if board.cell(1, 0) > -1 and board.cell(1, 0) != player:
+                if board.cell(2, 0) == -1:
+                    if board.cell(3, 0) > -1 and board.cell(3, 0) != player:
                         self.weight_table[2][0] += 100
-            if board.board[0][1] > -1 and board.board[0][
-                1] != player:
-                if board.board[0][2] == -1:
-                    if board.board[0][3] > -1 and board.board[0][
-                        3] != player:
+            if board.cell(0, 1) > -1 and board.cell(0, 1) != player:
+                if board.cell(0, 2) == -1:
+                    if board.cell(0, 3) > -1 and board.cell(0, 3) != player:
                         self.weight_table[0][2] += 100
 
-        if board.board[0][board.columns - 1] == -1:  # right top corner is free
-            if board.board[1][board.columns - 1] > -1 and board.board[1][
-                board.columns - 1] != player:
-                if board.board[2][board.columns - 1] == -1:
-                    if board.board[3][board.columns - 1] > -1 and board.board[3][board.columns - 1] != player:
+        if board.cell(0, COLS - 1) == -1:  # right top corner is free
+            if board.cell(1, COLS - 1) > -1 and board.cell(1, COLS - 1) != player:
+                if board.cell(2, COLS - 1) == -1:
+                    if board.cell(3, COLS - 1) > -1 and board.cell(3, COLS - 1) != player:
                         self.weight_table[2][0] += 100
-            if board.board[0][board.columns - 2] > -1 and board.board[0][
-                board.columns - 2] != player:
-                if board.board[0][board.columns - 3] == -1:
-                    if board.board[0][board.columns - 4] > -1 and board.board[0][
-                        board.columns - 4] != player:
-                        self.weight_table[0][board.columns - 3] += 100
-
-        return sum(
-            [
-                sum(map(lambda x: (x[0] == player) * x[1], zip(row, row_weights)))
-                for row, row_weights in zip(board.board, self.weight_table)
-            ]
+            if board.cell(0, COLS - 2) > -1 and board.cell(0, COLS - 2) != player:
+                if board.cell(0, COLS - 3) == -1:
+                    if board.cell(0, COLS - 4) > -1 and board.cell(0, COLS - 4) != player:
+                        self.weight_table[0][COLS - 3] += 100
+
+        return weighted_sum(
+            board.discs[player], [weight for row in self.weight_table for weight in row]
         )
@@ -1,6 +1,42 @@
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from copy import deepcopy
+from math import inf
 from typing import Union
 
-from board import Board, EMPTY
+from board import Board, COLS, ROWS
+
+CORNERS = {(0, 0), (0, COLS - 1), (ROWS - 1, 0), (ROWS - 1, COLS - 1)}
+
+# lower value is searched first: corners, then edges, then interior
+MOVE_PRIORITY = {
+    (row, column): 0 if (row, column) in CORNERS
+    else 1 if row in (0, ROWS - 1) or column in (0, COLS - 1)
+    else 2
+    for row in range(ROWS)
+    for column in range(COLS)
+}
+
+# kinds of values stored in transposition table
+EXACT = 0
+LOWER = 1  # real value is at least stored one (search was cut off)
+UPPER = 2  # real value is at most stored one (no move reached alpha)
+
+
+def order_moves(
+    moves: list[(int, int)], best_move: Union[tuple[int, int], None] = None
+) -> list[(int, int)]:
+    """
+    Sort moves so the most promising ones are searched first,
+    which makes alpha-beta cut off more branches.
+    best_move (e.g. from transposition table) always goes first.
+    """
+    ordered = sorted(moves, key=MOVE_PRIORITY.__getitem__)
+    if best_move in ordered:
+        ordered.remove(best_move)
+        ordered.insert(0, best_move)
+    return ordered
 
 
 def minimax(
@@ -11,14 +47,39 @@ def minimax(
     num_players: int,
     turns_passed: int,
     heuristic,
-    alpha: Union[int, None],
-    beta: Union[int, None],
+    alpha: float = -inf,
+    beta: float = inf,
+    table: Union[dict, None] = None,
 ):
+    """
+    Paranoid minimax with alpha-beta pruning: every other player is assumed
+    to minimize maximizing_player's evaluation, so with any number of players
+    it reduces to regular two sided alpha-beta.
+
+    table is a transposition table, it must only be shared between searches
+    with the same maximizing_player and heuristic.
+    """
     # max depth reached or game ended
     if depth == 0 or turns_passed == num_players:
-        return heuristic(board, current_player)
+        return heuristic(board, maximizing_player)
+
+    if table is None:
+        table = {}
+    key = (board.hash, current_player, turns_passed)
+    entry = table.get(key)
+    best_move = None
+    if entry is not None:
+        entry_depth, value, flag, best_move = entry
+        if entry_depth >= depth:
+            if flag == EXACT:
+                return value
+            if flag == LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if beta <= alpha:
+                return value
 
-    best_eval = None
     valid_moves = board.valid_moves(current_player)
     next_player = (current_player + 1) % num_players
 
@@ -34,10 +95,14 @@ def minimax(
             heuristic,
             alpha,
             beta,
+            table,
         )
 
-    for move_row, move_col in valid_moves:
-        board.place(move_row, move_col, current_player)
+    alpha_orig, beta_orig = alpha, beta
+    maximizing = current_player == maximizing_player
+    best_eval = -inf if maximizing else inf
+    for move in order_moves(valid_moves, best_move):
+        record = board.place_with_record(*move, current_player)
         evaluation = minimax(
             board,
             depth - 1,
@@ -48,19 +113,198 @@ def minimax(
             heuristic,
             alpha,
             beta,
+            table,
         )
-        board.board[move_row][move_col] = EMPTY
-        f = max if current_player == maximizing_player else min
-        best_eval = evaluation if best_eval is None else f(best_eval, evaluation)
+        board.undo(record)
 
         # alpha-beta pruning
-        if current_player == maximizing_player:
-            alpha = max(alpha, evaluation) if alpha is not None else evaluation
-            if beta is not None and beta <= alpha:
-                break
+        if maximizing:
+            if evaluation > best_eval:
+                best_eval, best_move = evaluation, move
+            alpha = max(alpha, evaluation)
         else:
-            beta = min(beta, evaluation) if beta is not None else evaluation
-            if alpha is not None and beta <= alpha:
-                break
+            if evaluation < best_eval:
+                best_eval, best_move = evaluation, move
+            beta = min(beta, evaluation)
+        if beta <= alpha:
+            break
+
+    if best_eval <= alpha_orig:
+        flag = UPPER
+    elif best_eval >= beta_orig:
+        flag = LOWER
+    else:
+        flag = EXACT
+    table[key] = (depth, best_eval, flag, best_move)
 
     return best_eval
+
+
+def _search_root_moves_parallel(
+    executor: Executor,
+    board: Board,
+    moves: list[(int, int)],
+    depth: int,
+    maximizing_player: int,
+    num_players: int,
+    heuristic,
+) -> list[float]:
+    next_player = (maximizing_player + 1) % num_players
+    futures = []
+    for move in moves:
+        child = deepcopy(board)
+        child.place(*move, maximizing_player)
+        futures.append(
+            executor.submit(
+                minimax,
+                child,
+                depth - 1,
+                maximizing_player,
+                next_player,
+                num_players,
+                0,
+                heuristic,
+            )
+        )
+    return [future.result() for future in futures]
+
+
+def minimax_root(
+    board: Board,
+    depth: int,
+    maximizing_player: int,
+    num_players: int,
+    heuristic,
+    workers: Union[int, None] = 1,
+    table: Union[dict, None] = None,
+    first_move: Union[tuple[int, int], None] = None,
+    executor: Union[Executor, None] = None,
+) -> (float, Union[tuple[int, int], None]):
+    """
+    Pick best move of maximizing_player, return (evaluation, move).
+    first_move (e.g. best move of shallower search) is searched first.
+
+    By default root moves are searched one by one on board, sharing alpha and
+    table between them. Given an executor, or more than one worker (None means
+    number of CPUs), subtrees of root moves are searched in separate processes
+    instead, each on its own board copy and transposition table, so table
+    can't be passed then. Starting processes costs more than the whole search
+    at shallow depths, so only opt in for deep searches.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    parallel = executor is not None or workers > 1
+    if parallel and table is not None:
+        raise ValueError("Transposition table can't be shared between processes.")
+
+    moves = order_moves(board.valid_moves(maximizing_player), first_move)
+    next_player = (maximizing_player + 1) % num_players
+
+    if parallel and len(moves) > 1:
+        search_args = (board, moves, depth, maximizing_player, num_players, heuristic)
+        if executor is not None:
+            evaluations = _search_root_moves_parallel(executor, *search_args)
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(moves))) as pool:
+                evaluations = _search_root_moves_parallel(pool, *search_args)
+    else:
+        if table is None:
+            table = {}
+        evaluations = []
+        best_eval = -inf
+        for move in moves:
+            record = board.place_with_record(*move, maximizing_player)
+            # moves that can't beat the best one found so far get cut off early
+            evaluation = minimax(
+                board,
+                depth - 1,
+                maximizing_player,
+                next_player,
+                num_players,
+                0,
+                heuristic,
+                alpha=best_eval,
+                table=table,
+            )
+            board.undo(record)
+            best_eval = max(best_eval, evaluation)
+            evaluations.append(evaluation)
+
+    best_eval = -inf
+    best_move = None
+    for move, evaluation in zip(moves, evaluations):
+        if evaluation > best_eval:
+            best_eval, best_move = evaluation, move
+    return best_eval, best_move
+
+
+def iterative_deepen(
+    board: Board,
+    max_depth: int,
+    time_budget: Union[float, None],
+    maximizing_player: int,
+    num_players: int,
+    heuristic,
+    workers: Union[int, None] = 1,
+) -> (float, Union[tuple[int, int], None]):
+    """
+    Run minimax_root with depth 1, 2, ... max_depth, return (evaluation, move)
+    of the deepest completed search. Best move is carried over, so each search
+    tries move found best by previous one first. Sequential search (default)
+    also shares one transposition table across depths; with more workers all
+    depths share one process pool instead, but no table.
+
+    No deeper search is started once time_budget (in seconds) is exceeded.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return _deepen(
+                board,
+                max_depth,
+                time_budget,
+                maximizing_player,
+                num_players,
+                heuristic,
+                table=None,
+                executor=executor,
+            )
+    return _deepen(
+        board,
+        max_depth,
+        time_budget,
+        maximizing_player,
+        num_players,
+        heuristic,
+        table={},
+        executor=None,
+    )
+
+
+def _deepen(
+    board: Board,
+    max_depth: int,
+    time_budget: Union[float, None],
+    maximizing_player: int,
+    num_players: int,
+    heuristic,
+    table: Union[dict, None],
+    executor: Union[Executor, None],
+) -> (float, Union[tuple[int, int], None]):
+    start = time.monotonic()
+    result = (-inf, None)
+    for depth in range(1, max_depth + 1):
+        result = minimax_root(
+            board,
+            depth,
+            maximizing_player,
+            num_players,
+            heuristic,
+            table=table,
+            first_move=result[1],
+            executor=executor,
+        )
+        if time_budget is not None and time.monotonic() - start > time_budget:
+            break
+    return result
@@ -1,7 +1,5 @@
-from copy import deepcopy
-
 from board import Board
-from minimax import minimax
+from minimax import iterative_deepen
 from heuristics import Heuristic
 
 PLAYER_MAPPINGS = {
@@ -54,9 +52,20 @@ class HumanPlayer(Player):
 
 
 class AIPlayer(Player):
-    def __init__(self, turn, heuristic: Heuristic) -> None:
+    def __init__(
+        self,
+        turn,
+        heuristic: Heuristic,
+        workers: int = 1,
+        time_budget: float = None,
+    ) -> None:
         super().__init__(turn)
         self.heuristic = heuristic
+        # processes searching root moves in parallel (None means all CPUs),
+        # worth it only for deep searches
+        self.workers = workers
+        # seconds after which no deeper search is started, None means no limit
+        self.time_budget = time_budget
 
     def print_board(self, board: Board) -> None:
         pass  # Robots don't need visuals
@@ -65,29 +74,15 @@ class AIPlayer(Player):
         pass  # Robots don't need visuals
 
     def get_move(self, game) -> (int, int):
-        best_eval = None
-        best_move = None
-        valid_moves = game.board.valid_moves(self.turn)
-        next_player = (self.turn + 1) % len(game.players)
-
-        for move_row, move_col in valid_moves:
-            # TODO(tkarwowski): making this backtrace instead of coping breaks everything
-            new_board = deepcopy(game.board)
-            new_board.place(move_row, move_col, self.turn)
-            evaluation = minimax(
-                new_board,
-                game.minimax_depth - 1,
-                self.turn,
-                next_player,
-                len(game.players),
-                0,
-                self.heuristic.evaluate,
-                None,
-                None,
-            )
-            best_eval = evaluation if best_eval is None else max(best_eval, evaluation)
-            if best_eval == evaluation:
-                best_move = (move_row, move_col)
+        _, best_move = iterative_deepen(
+            game.board,
+            game.minimax_depth,
+            self.time_budget,
+            self.turn,
+            len(game.players),
+            self.heuristic.evaluate,
+            self.workers,
+        )
 
         # TODO(tkarwowski): temporary debug statement (but looks cool)
         print(game.board)
@@ -0,0 +1,156 @@
+import random
+
+from board import Board, COLS, EMPTY, ROWS, ZOBRIST
+
+DIRS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+def naive_flips(cells, row, column, player) -> set[(int, int)]:
+    """
+    Reference implementation walking list of lists cell by cell.
+    """
+    flips = set()
+    for dy, dx in DIRS:
+        visited_discs = []
+        y, x = row + dy, column + dx
+        while 0 <= y < ROWS and 0 <= x < COLS:
+            if cells[y][x] == player:
+                flips.update(visited_discs)
+                break
+            elif cells[y][x] == EMPTY:
+                break
+            visited_discs.append((y, x))
+            y, x = y + dy, x + dx
+    return flips
+
+
+def naive_valid_moves(cells, player) -> set[(int, int)]:
+    return {
+        (row, column)
+        for row in range(ROWS)
+        for column in range(COLS)
+        if cells[row][column] == EMPTY and naive_flips(cells, row, column, player)
+    }
+
+
+def squares(mask: int) -> set[(int, int)]:
+    return {divmod(square, COLS) for square in range(ROWS * COLS) if mask >> square & 1}
+
+
+def board_from(discs: dict) -> Board:
+    """
+    Build board from {(row, column): player}.
+    """
+    board = Board()
+    for (row, column), player in discs.items():
+        board.discs[player] |= 1 << (row * COLS + column)
+        board.hash ^= ZOBRIST[row * COLS + column][player]
+    return board
+
+
+def full_hash(board: Board) -> int:
+    hash_ = 0
+    for row, cells in enumerate(board.board):
+        for column, cell in enumerate(cells):
+            if cell != EMPTY:
+                hash_ ^= ZOBRIST[row * COLS + column][cell]
+    return hash_
+
+
+def test_starting_position():
+    board = Board()
+    board.setup_three_players()
+    cells = board.board
+
+    assert cells[3][3:6] == [0, 1, 0]
+    assert cells[4][3:6] == [2, 0, 2]
+    assert cells[5][3:6] == [1, 2, 1]
+    assert [discs.bit_count() for discs in board.discs] == [3, 3, 3]
+    assert board.hash == full_hash(board)
+    assert board.get_winner() is None
+    for player in range(3):
+        assert set(board.valid_moves(player)) == naive_valid_moves(cells, player)
+
+
+def test_moves_dont_wrap_around_edges():
+    # opposing disc on an edge with own disc behind it; shifting past it
+    # lands on the opposite edge (next/previous bit) if masks are wrong
+    for own, opponent, wrapped in (
+        ((2, 7), (2, 8), (3, 0)),  # east
+        ((6, 1), (6, 0), (5, 8)),  # west
+        ((5, 7), (4, 8), (4, 0)),  # north-east
+        ((5, 1), (4, 0), (2, 8)),  # north-west
+        ((0, 7), (1, 8), (3, 0)),  # south-east
+        ((3, 1), (4, 0), (4, 8)),  # south-west
+    ):
+        board = board_from({own: 0, opponent: 1})
+        cells = board.board
+
+        assert board.valid_moves(0) == ()
+        assert board._move_flips(*wrapped, 0) is None
+        for row in range(ROWS):
+            for column in range(COLS):
+                if cells[row][column] == EMPTY:
+                    flips = board._move_flips(row, column, 0)
+                    assert squares(flips or 0) == naive_flips(cells, row, column, 0)
+
+
+def test_random_games_match_reference():
+    rng = random.Random(2137)
+    for _ in range(30):
+        board = Board()
+        board.setup_three_players()
+        player = 0
+        players_stuck = 0
+        while players_stuck < 3:
+            cells = board.board
+            moves = board.valid_moves(player)
+            assert set(moves) == naive_valid_moves(cells, player)
+            assert board.has_valid_move(player) == bool(moves)
+            for row in range(ROWS):
+                for column in range(COLS):
+                    if cells[row][column] == EMPTY:
+                        flips = board._move_flips(row, column, player)
+                        assert squares(flips or 0) == naive_flips(
+                            cells, row, column, player
+                        )
+                        assert board.validate_placing(row, column, player)[0] == (
+                            flips is not None
+                        )
+
+            if moves:
+                players_stuck = 0
+                row, column = rng.choice(moves)
+                expected = naive_flips(cells, row, column, player)
+                assert squares(board.place(row, column, player)) == expected
+                for y, x in expected | {(row, column)}:
+                    cells[y][x] = player
+                assert board.board == cells
+                assert board.hash == full_hash(board)
+            else:
+                players_stuck += 1
+            player = (player + 1) % 3
+
+
+def test_place_with_record_undo():
+    board = Board()
+    board.setup_three_players()
+    before = (list(board.discs), board.hash)
+    row, column = board.valid_moves(0)[0]
+
+    record = board.place_with_record(row, column, 0)
+    assert (list(board.discs), board.hash) != before
+    board.undo(record)
+    assert (list(board.discs), board.hash) == before
+
+
+def test_get_winner():
+    board = Board()
+    for discs, winner in (
+        ((0b1, 0, 0), 0),
+        ((0, 0b111, 0b1), 1),
+        ((0b1, 0b10, 0b11100), 2),
+        ((0b111, 0b111000, 0b1), None),
+    ):
+        board.discs = list(discs)
+        assert board.get_winner() == winner
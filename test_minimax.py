@@ -0,0 +1,140 @@
+import random
+from copy import deepcopy
+
+from board import Board
+from heuristics import GreedyHeuristic, WeightedSumHeuristic, WedgeHeuristic
+from minimax import iterative_deepen, minimax, minimax_root, order_moves
+
+NUM_PLAYERS = 3
+
+
+def plain_minimax(
+    board, depth, maximizing_player, current_player, turns_passed, heuristic
+):
+    """
+    Reference paranoid minimax: no pruning, no table, board copied per move.
+    """
+    if depth == 0 or turns_passed == NUM_PLAYERS:
+        return heuristic(board, maximizing_player)
+
+    next_player = (current_player + 1) % NUM_PLAYERS
+    valid_moves = board.valid_moves(current_player)
+    if not valid_moves:
+        return plain_minimax(
+            board,
+            depth - 1,
+            maximizing_player,
+            next_player,
+            turns_passed + 1,
+            heuristic,
+        )
+
+    evaluations = []
+    for move in valid_moves:
+        new_board = deepcopy(board)
+        new_board.place(*move, current_player)
+        evaluations.append(
+            plain_minimax(
+                new_board, depth - 1, maximizing_player, next_player, 0, heuristic
+            )
+        )
+    return max(evaluations) if current_player == maximizing_player else min(evaluations)
+
+
+def plain_root(board, depth, player, heuristic):
+    best_eval, best_move = None, None
+    # same order as searched moves, so ties resolve to the same move
+    for move in order_moves(board.valid_moves(player)):
+        new_board = deepcopy(board)
+        new_board.place(*move, player)
+        evaluation = plain_minimax(
+            new_board, depth - 1, player, (player + 1) % NUM_PLAYERS, 0, heuristic
+        )
+        if best_eval is None or evaluation > best_eval:
+            best_eval, best_move = evaluation, move
+    return best_eval, best_move
+
+
+def random_positions(seed: int, count: int):
+    """
+    Yield (board, player to move) reached by random play.
+    """
+    rng = random.Random(seed)
+    while count:
+        board = Board()
+        board.setup_three_players()
+        player = 0
+        for _ in range(rng.randrange(50)):
+            moves = board.valid_moves(player)
+            if moves:
+                board.place(*rng.choice(moves), player)
+            player = (player + 1) % NUM_PLAYERS
+        if board.valid_moves(player):
+            count -= 1
+            yield board, player
+
+
+def test_alpha_beta_matches_plain_minimax():
+    heuristics = [GreedyHeuristic(), WeightedSumHeuristic(), WedgeHeuristic()]
+    for i, (board, player) in enumerate(random_positions(seed=7, count=30)):
+        heuristic = heuristics[i % len(heuristics)].evaluate
+        depth = i % 3 + 1
+        before = (list(board.discs), board.hash)
+
+        expected = plain_root(board, depth, player, heuristic)
+        assert minimax_root(board, depth, player, NUM_PLAYERS, heuristic) == expected
+        assert (list(board.discs), board.hash) == before
+
+
+def test_iterative_deepening_matches_plain_minimax():
+    # transposition table is shared across depths, so its bound flags matter
+    heuristics = [WeightedSumHeuristic(), WedgeHeuristic()]
+    for i, (board, player) in enumerate(random_positions(seed=11, count=12)):
+        heuristic = heuristics[i % len(heuristics)].evaluate
+        depth = 3
+        before = (list(board.discs), board.hash)
+
+        evaluation, move = iterative_deepen(
+            board, depth, None, player, NUM_PLAYERS, heuristic
+        )
+        assert evaluation == plain_root(board, depth, player, heuristic)[0]
+        assert move in board.valid_moves(player)
+        assert (list(board.discs), board.hash) == before
+
+
+def test_transposition_table_bounds_with_shared_table():
+    # every search below reuses one table with different windows, so entries
+    # stored as bounds by one search decide cutoffs in the following ones
+    rng = random.Random(3)
+    heuristic = WeightedSumHeuristic().evaluate
+    for board, player in random_positions(seed=5, count=4):
+        depth = 3
+        next_player = (player + 1) % NUM_PLAYERS
+        table = {}
+        for move in board.valid_moves(player)[:4]:
+            new_board = deepcopy(board)
+            new_board.place(*move, player)
+            true_value = plain_minimax(
+                new_board, depth, player, next_player, 0, heuristic
+            )
+            for _ in range(6):
+                alpha = true_value + rng.randint(-60, 40)
+                beta = alpha + rng.randint(1, 60)
+                value = minimax(
+                    new_board,
+                    depth,
+                    player,
+                    next_player,
+                    NUM_PLAYERS,
+                    0,
+                    heuristic,
+                    alpha,
+                    beta,
+                    table,
+                )
+                if true_value <= alpha:
+                    assert true_value <= value <= alpha
+                elif true_value >= beta:
+                    assert beta <= value <= true_value
+                else:
+                    assert value == true_value